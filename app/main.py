@@ -11,6 +11,8 @@ from flask_cors import CORS  # type: ignore
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from app.utils.inspection import InspectFile
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -40,10 +42,8 @@ def allowed_file(filename):
 def index():
     return render_template('index.html')
 
-@app.route('/upload', methods=['POST'])
-def upload_file():
-    logger.info("Received file upload request")
-    
+def handle_upload(analyze):
+    """Validate and save the uploaded file, run analyze on it and clean up"""
     # Check if file exists in request
     if 'file' not in request.files:
         logger.error("No file part in request")
@@ -69,8 +69,7 @@ def upload_file():
         file.save(filepath)
         logger.info(f"File saved temporarily to: {filepath}")
         
-        # Simulate analysis (replace with actual analysis code)
-        results = simulate_analysis(filepath)
+        results = analyze(filepath)
         
         return jsonify(results)
         
@@ -87,17 +86,17 @@ def upload_file():
             except Exception as e:
                 logger.error(f"Error removing temp file: {str(e)}")
 
-def simulate_analysis(filepath):
-    """Simulate analysis results for demonstration"""
-    return {
-        'type': 'Windows Executable',
-        'webhook': 'https://discord.com/api/webhooks/1234567890/abcdefghijklmnopqrstuvwxyz1234567890',
-        'python_version': '3.9',
-        'additional_info': {
-            'file_size': f"{os.path.getsize(filepath) / 1024 / 1024:.2f} MB",
-            'analysis_complete': True
-        }
-    }
+@app.route('/upload', methods=['POST'])
+def upload_file():
+    """Same report as /inspect, without the TOC name list"""
+    logger.info("Received file upload request")
+    return handle_upload(InspectFile)
+
+@app.route('/inspect', methods=['POST'])
+def inspect_file():
+    """Header/TOC-only metadata report, meant to run before any deobfuscation"""
+    logger.info("Received file inspect request")
+    return handle_upload(lambda filepath: InspectFile(filepath, listEntries=True))
 
 if __name__ == '__main__':
     try:
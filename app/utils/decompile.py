@@ -1,6 +1,16 @@
 import os
 import subprocess
 import tempfile
+import re
+import atexit
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .inspection import PythonVersionFromMagic
+
+logger = logging.getLogger(__name__)
 
 def unzipJava(jarPath):
     try:
@@ -17,4 +27,196 @@ def checkUPX(filePath):
     except FileNotFoundError:
         return False
     except subprocess.CalledProcessError:
-        return False
\ No newline at end of file
+        return False
+
+class DecompileError(Exception):
+    pass
+
+def PycHeaderSize(pycData):
+    version = PythonVersionFromMagic(pycData[:4])
+    if version is None:
+        raise DecompileError("Unknown pyc magic")
+    major, minor = (int(part) for part in version.split('.'))
+    if (major, minor) >= (3, 7):
+        return 16
+    if (major, minor) >= (3, 3):
+        return 12
+    return 8
+
+def CodeHash(pycData):
+    # Hash the marshalled code only so rebuilt modules with new timestamps still hit
+    return hashlib.sha256(pycData[:4] + pycData[PycHeaderSize(pycData):]).hexdigest()
+
+class PycdcBackend:
+    def __init__(self, binary='pycdc', timeout=30):
+        self.binary = binary
+        self.timeout = timeout
+        self.name = os.path.basename(binary)
+
+    def __call__(self, pycPath):
+        try:
+            result = subprocess.run([self.binary, pycPath], capture_output=True, text=True,
+                                    errors='replace', timeout=self.timeout)
+        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+            raise DecompileError(f"{self.name} failed: {str(e)}")
+        # pycdc often stops part-way on unsupported opcodes; partial output
+        # would otherwise be cached as if it were complete
+        if result.returncode != 0:
+            raise DecompileError(f"{self.name} failed ({result.returncode}): {result.stderr.strip()}")
+        return result.stdout
+
+class StubBackend:
+    """Local stand-in for pycdc: dumps printable strings from the code object"""
+    name = 'stub'
+
+    def __call__(self, pycPath):
+        with open(pycPath, 'rb') as f:
+            data = f.read()
+        strings = re.findall(rb'[\x20-\x7e]{4,}', data[PycHeaderSize(data):])
+        return '\n'.join(s.decode('ascii') for s in strings)
+
+def _runOne(backend, workDir, key, pycData):
+    pycPath = os.path.join(workDir, f"{key}.pyc")
+    try:
+        with open(pycPath, 'wb') as f:
+            f.write(pycData)
+        return (key, backend(pycPath), None)
+    except Exception as e:
+        return (key, None, str(e))
+
+class DecompilerService:
+    """Shared decompiler threads with an LRU cache keyed by code hash.
+
+    pycdc/pycdas take one file per run, so each uncached blob costs one
+    subprocess; threads keep `workers` of them running at once (subprocess.run
+    releases the GIL). workers=0 runs the backend inline, which is what the
+    stub is meant for.
+
+    hits counts items answered without the backend (cached or repeated in the
+    same call), misses counts the unique blobs sent to it.
+    """
+    def __init__(self, backend=None, workers=4, cacheSize=4096):
+        self.backend = backend or PycdcBackend()
+        self.workers = workers
+        self.cacheSize = cacheSize
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.executor = None
+
+    def _getExecutor(self):
+        # Created on first use rather than at import/startup time
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                   thread_name_prefix='decompiler')
+            return self.executor
+
+    def _resetExecutor(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+    def _run(self, pending, workDir):
+        if self.workers <= 0:
+            return [_runOne(self.backend, workDir, key, pyc) for key, pyc in pending.items()]
+        try:
+            executor = self._getExecutor()
+            futures = [executor.submit(_runOne, self.backend, workDir, key, pyc)
+                       for key, pyc in pending.items()]
+            return [future.result() for future in futures]
+        except Exception as e:
+            # A dead executor would otherwise fail every later call on the shared service
+            logger.error(f"Decompiler pool failed, recreating it: {str(e)}")
+            self._resetExecutor()
+            return [(key, None, str(e)) for key in pending]
+
+    def _cacheGet(self, key):
+        with self.lock:
+            if key not in self.cache:
+                return None
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return self.cache[key]
+
+    def _cachePut(self, key, source):
+        with self.lock:
+            self.cache[key] = source
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cacheSize:
+                self.cache.popitem(last=False)
+
+    def DecompileMany(self, pycs):
+        """Decompile a list of pyc blobs, returning source text (or None) per item"""
+        keys = []
+        for pyc in pycs:
+            try:
+                keys.append(f"{self.backend.name}-{CodeHash(pyc)}")
+            except DecompileError as e:
+                # e.g. headerless marshal data from PyInstaller 5.3+ module entries
+                logger.warning(f"Skipping decompilation: {str(e)}")
+                keys.append(None)
+
+        results = {}
+        pending = {}
+        for key, pyc in zip(keys, pycs):
+            if key is None:
+                continue
+            source = self._cacheGet(key)
+            if source is not None:
+                results[key] = source
+            elif key in pending:
+                with self.lock:
+                    self.hits += 1
+            else:
+                pending[key] = pyc
+        with self.lock:
+            self.misses += len(pending)
+
+        finished = []
+        if pending:
+            with tempfile.TemporaryDirectory(prefix='ratters_decompile_') as workDir:
+                finished = self._run(pending, workDir)
+        for key, source, error in finished:
+            if error is not None:
+                # Failures are not cached so a fixed backend gets another chance
+                logger.warning(f"Decompilation failed for {key}: {error}")
+                continue
+            self._cachePut(key, source)
+            results[key] = source
+        return [results.get(key) if key is not None else None for key in keys]
+
+    def Decompile(self, pycData):
+        return self.DecompileMany([pycData])[0]
+
+    def DecompileFiles(self, paths):
+        pycs = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                pycs.append(f.read())
+        return self.DecompileMany(pycs)
+
+    def close(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+_services = {}
+_servicesLock = threading.Lock()
+
+def GetDecompilerService(binary='pycdc'):
+    """Process-wide shared service so worker pools and caches outlive a request"""
+    with _servicesLock:
+        if binary not in _services:
+            _services[binary] = DecompilerService(PycdcBackend(binary))
+            atexit.register(_services[binary].close)
+        return _services[binary]
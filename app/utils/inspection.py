@@ -0,0 +1,245 @@
+import os
+import re
+import time
+import struct
+import bisect
+import zipfile
+from .pyinstaller.pyinstallerExceptions import ExtractionError
+
+# Only the file header, the CArchive cookie and the TOC are read here, nothing
+# is decompressed, so a report costs a few small reads regardless of file size.
+
+MEI_MAGIC = b'MEI\014\013\012\013\016'
+COOKIE_SIZE_20 = 24   # PyInstaller 2.0
+COOKIE_SIZE_21 = 88   # PyInstaller 2.1+ (adds the 64 byte python library name)
+COOKIE_SEARCH_LIMIT = 1024 * 1024  # signatures and padding may follow the cookie
+SEARCH_CHUNK_SIZE = 8192
+TOC_ENTRY_STRUCT = struct.Struct('!iIIIBc')
+
+# First CPython magic number of each release, used for dev/rc magics as well.
+# The trailing None starts at the first 3.15 magic; newer magics are not recognised.
+PYC_MAGIC_VERSIONS = [
+    (3000, '3.0'), (3140, '3.1'), (3160, '3.2'), (3190, '3.3'), (3250, '3.4'),
+    (3320, '3.5'), (3360, '3.6'), (3390, '3.7'), (3400, '3.8'), (3420, '3.9'),
+    (3430, '3.10'), (3450, '3.11'), (3500, '3.12'), (3550, '3.13'), (3600, '3.14'),
+    (3650, None),
+]
+PYC_MAGIC_KEYS = [magic for magic, _ in PYC_MAGIC_VERSIONS]
+# Python 2 magics are not ordered alongside 3.x, so they are matched by range.
+PYC_MAGIC_VERSIONS_2X = [
+    (50823, 50823, '2.0'), (60202, 60202, '2.1'), (60717, 60717, '2.2'),
+    (62011, 62021, '2.3'), (62041, 62061, '2.4'), (62071, 62131, '2.5'),
+    (62151, 62161, '2.6'), (62171, 62211, '2.7'),
+]
+
+FAMILY_MARKERS = [
+    ('Blank Grabber', re.compile(r'(^|/)(blank\.aes|stub-o|loader-o)', re.I)),
+    ('Luna Grabber', re.compile(r'luna', re.I)),
+    ('Empyrean', re.compile(r'empyrean|vespy', re.I)),
+]
+
+class TOCInfo:
+    __slots__ = ['name', 'offset', 'compsize', 'size', 'flag', 'typecompressed']
+    def __init__(self, name, offset, compsize, size, flag, typecompressed):
+        self.name = name
+        self.offset = offset
+        self.compsize = compsize
+        self.size = size
+        self.flag = flag
+        self.typecompressed = typecompressed
+
+def PythonVersionFromMagic(magic):
+    if len(magic) < 4 or magic[2:4] != b'\r\n':
+        return None
+    number = struct.unpack('<H', magic[:2])[0]
+    for low, high, version in PYC_MAGIC_VERSIONS_2X:
+        if low <= number <= high:
+            return version
+    index = bisect.bisect_right(PYC_MAGIC_KEYS, number) - 1
+    if index < 0:
+        return None
+    return PYC_MAGIC_VERSIONS[index][1]
+
+def DetectFileType(header):
+    if header.startswith(b'MZ'):
+        return 'Windows Executable'
+    if header.startswith(b'\x7fELF'):
+        return 'ELF Executable'
+    if header.startswith(b'PK\x03\x04'):
+        return 'Java Archive'
+    if PythonVersionFromMagic(header[:4]):
+        return 'Python Bytecode'
+    return 'Unknown'
+
+def _isDLL(fPtr):
+    fPtr.seek(0x3c)
+    peOffset = struct.unpack('<I', fPtr.read(4))[0]
+    fPtr.seek(peOffset)
+    if fPtr.read(4) != b'PE\0\0':
+        return False
+    fPtr.seek(peOffset + 22)
+    characteristics = struct.unpack('<H', fPtr.read(2))[0]
+    return bool(characteristics & 0x2000)
+
+def _findCookie(fPtr, fileSize):
+    end = fileSize
+    limit = max(0, fileSize - COOKIE_SEARCH_LIMIT)
+    while end > limit:
+        start = max(limit, end - SEARCH_CHUNK_SIZE)
+        fPtr.seek(start)
+        # Overlap chunks so a magic split across a boundary is still found
+        data = fPtr.read(end - start + len(MEI_MAGIC) - 1)
+        pos = data.rfind(MEI_MAGIC)
+        if pos != -1:
+            return start + pos
+        end = start
+    return None
+
+def _pyinstallerVersion(cookieSize, names):
+    if cookieSize == COOKIE_SIZE_20:
+        return '2.0'
+    # The bootstrap modules were renamed in 5.3 (pyimod01_os_path, shipped
+    # since 3.0, became pyimod01_archive)
+    if 'pyimod01_archive' in names:
+        return '5.3+'
+    if 'pyimod01_os_path' in names:
+        return '3.0-5.2'
+    return '2.1+'
+
+def ReadPyInstallerTOC(fPtr, fileSize):
+    cookiePos = _findCookie(fPtr, fileSize)
+    if cookiePos is None:
+        return None
+    try:
+        fPtr.seek(cookiePos + COOKIE_SIZE_20)
+        cookieSize = COOKIE_SIZE_21 if b'python' in fPtr.read(64).lower() else COOKIE_SIZE_20
+        fPtr.seek(cookiePos)
+        (_, lengthofPackage, toc, tocLen, pyver) = struct.unpack('!8sIIII', fPtr.read(COOKIE_SIZE_20))
+
+        tailBytes = fileSize - cookiePos - cookieSize
+        overlayPos = fileSize - (lengthofPackage + tailBytes)
+        fPtr.seek(overlayPos + toc)
+        tocData = fPtr.read(tocLen)
+    except (struct.error, OSError, ValueError) as e:
+        raise ExtractionError(f"Error reading cookie: {str(e)}")
+
+    if len(tocData) < tocLen:
+        raise ExtractionError("Error parsing TOC: truncated TOC")
+
+    entries = []
+    parsed = 0
+    while parsed < len(tocData):
+        try:
+            (entrySize, offset, compsize, size, flag, typecompressed) = TOC_ENTRY_STRUCT.unpack_from(tocData, parsed)
+        except struct.error as e:
+            raise ExtractionError(f"Error parsing TOC: {str(e)}")
+        if entrySize <= TOC_ENTRY_STRUCT.size or parsed + entrySize > len(tocData):
+            raise ExtractionError("Error parsing TOC: invalid entry size")
+        name = tocData[parsed + TOC_ENTRY_STRUCT.size:parsed + entrySize]
+        name = name.rstrip(b'\0').decode('utf-8', errors='replace')
+        entries.append(TOCInfo(name, offset, compsize, size, flag, typecompressed.decode('latin-1')))
+        parsed += entrySize
+
+    if pyver >= 100:
+        cookieVersion = f"{pyver // 100}.{pyver % 100}"
+    else:
+        cookieVersion = f"{pyver // 10}.{pyver % 10}"
+
+    return {
+        'overlay_pos': overlayPos,
+        'overlay_size': lengthofPackage + tailBytes,
+        'cookie_python_version': cookieVersion,
+        'pyinstaller_version': _pyinstallerVersion(cookieSize, {e.name for e in entries}),
+        'entries': entries,
+    }
+
+def _firstPycMagic(fPtr, overlayPos, entries):
+    # PYZ archives carry the magic uncompressed right after b'PYZ\0'; plain
+    # module entries only help when they were stored uncompressed.
+    for entry in entries:
+        if entry.typecompressed == 'z':
+            fPtr.seek(overlayPos + entry.offset)
+            header = fPtr.read(8)
+            if header[:4] == b'PYZ\0' and PythonVersionFromMagic(header[4:8]):
+                return header[4:8]
+        elif entry.typecompressed in ('m', 'M') and entry.flag == 0:
+            # PyInstaller 5.3+ stores these without a pyc header, so only
+            # trust the first bytes when they really are a magic
+            fPtr.seek(overlayPos + entry.offset)
+            magic = fPtr.read(4)
+            if PythonVersionFromMagic(magic):
+                return magic
+    return None
+
+def SuspectFamily(names):
+    for family, pattern in FAMILY_MARKERS:
+        if any(pattern.search(name) for name in names):
+            return family
+    return None
+
+def InspectFile(path, listEntries=False):
+    started = time.perf_counter()
+    fileSize = os.path.getsize(path)
+    report = {
+        'type': 'Unknown',
+        'webhook': None,
+        'python_version': None,
+        'pyinstaller_version': None,
+        'family': None,
+        'additional_info': {
+            'file_size': f"{fileSize / 1024 / 1024:.2f} MB",
+            'entry_count': 0,
+        },
+    }
+    info = report['additional_info']
+
+    with open(path, 'rb') as fPtr:
+        header = fPtr.read(16)
+        report['type'] = DetectFileType(header)
+
+        if report['type'] == 'Windows Executable':
+            try:
+                if _isDLL(fPtr):
+                    report['type'] = 'Windows DLL'
+            except struct.error:
+                pass
+
+        if report['type'] == 'Python Bytecode':
+            report['python_version'] = PythonVersionFromMagic(header[:4])
+            info['pyc_magic'] = header[:4].hex()
+
+        elif report['type'] == 'Java Archive':
+            # zipfile only reads the central directory until a member is opened
+            try:
+                with zipfile.ZipFile(fPtr) as jar:
+                    members = jar.infolist()
+                info['entry_count'] = len(members)
+                info['compressed_size'] = sum(m.compress_size for m in members)
+                info['uncompressed_size'] = sum(m.file_size for m in members)
+            except zipfile.BadZipFile as e:
+                info['error'] = str(e)
+
+        elif report['type'] in ('Windows Executable', 'Windows DLL', 'ELF Executable'):
+            try:
+                archive = ReadPyInstallerTOC(fPtr, fileSize)
+            except ExtractionError as e:
+                archive = None
+                info['error'] = str(e)
+            if archive:
+                entries = archive['entries']
+                names = [e.name for e in entries]
+                magic = _firstPycMagic(fPtr, archive['overlay_pos'], entries)
+                report['pyinstaller_version'] = archive['pyinstaller_version']
+                report['python_version'] = PythonVersionFromMagic(magic) if magic else archive['cookie_python_version']
+                report['family'] = SuspectFamily(names)
+                if magic:
+                    info['pyc_magic'] = magic.hex()
+                info['entry_count'] = len(entries)
+                info['archive_size'] = archive['overlay_size']
+                info['compressed_size'] = sum(e.compsize for e in entries)
+                info['uncompressed_size'] = sum(e.size for e in entries)
+                if listEntries:
+                    info['entries'] = names
+
+    info['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return report
@@ -0,0 +1,96 @@
+import os
+import sys
+import marshal
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.decompile import DecompilerService, StubBackend, PycdcBackend, CodeHash, PycHeaderSize
+
+def makePyc(source, timestamp=b'\0' * 4):
+    code = compile(source, '<test>', 'exec')
+    return importlib.util.MAGIC_NUMBER + b'\0' * 4 + timestamp + b'\0' * 4 + marshal.dumps(code)
+
+def test_code_hash_ignores_timestamp():
+    first = makePyc("W = 'webhook_one'", b'\x01\x02\x03\x04')
+    second = makePyc("W = 'webhook_one'", b'\x05\x06\x07\x08')
+    assert first != second
+    assert CodeHash(first) == CodeHash(second)
+    assert CodeHash(first) != CodeHash(makePyc("W = 'webhook_two'"))
+
+def test_header_size_by_version():
+    assert PycHeaderSize((62161).to_bytes(2, 'little') + b'\r\n') == 8
+    assert PycHeaderSize((3310).to_bytes(2, 'little') + b'\r\n') == 12
+    assert PycHeaderSize((3413).to_bytes(2, 'little') + b'\r\n') == 16
+
+def test_cache_hits_and_misses():
+    pyc = makePyc("W = 'webhook_one'")
+    with DecompilerService(StubBackend(), workers=0) as service:
+        first, second = service.DecompileMany([pyc, pyc])
+        assert 'webhook_one' in first
+        assert first == second
+        assert (service.hits, service.misses) == (1, 1)
+
+        assert service.Decompile(makePyc("W = 'webhook_one'", b'\x09\x09\x09\x09')) == first
+        assert (service.hits, service.misses) == (2, 1)
+
+def test_cache_eviction():
+    pycs = [makePyc(f"W = 'webhook_{i}'") for i in range(3)]
+    with DecompilerService(StubBackend(), workers=0, cacheSize=2) as service:
+        service.DecompileMany(pycs)
+        assert len(service.cache) == 2
+        service.Decompile(pycs[0])
+        assert (service.hits, service.misses) == (0, 4)
+        service.Decompile(pycs[2])
+        assert service.hits == 1
+
+def test_bad_items_return_none():
+    pyc = makePyc("W = 'webhook_one'")
+    headerless = b'\xe3\0\0\0' + b'\0' * 16
+    with DecompilerService(StubBackend(), workers=0) as service:
+        source, missing = service.DecompileMany([pyc, headerless])
+        assert 'webhook_one' in source
+        assert missing is None
+        assert service.misses == 1
+
+def test_failures_are_not_cached():
+    class FailingBackend(StubBackend):
+        def __call__(self, pycPath):
+            raise RuntimeError("boom")
+
+    pyc = makePyc("W = 'webhook_one'")
+    with DecompilerService(FailingBackend(), workers=0) as service:
+        assert service.Decompile(pyc) is None
+        assert len(service.cache) == 0
+        assert service.Decompile(pyc) is None
+        assert service.misses == 2
+
+def test_worker_threads():
+    pycs = [makePyc(f"W = 'webhook_{i}'") for i in range(6)]
+    with DecompilerService(StubBackend(), workers=3) as service:
+        assert service.executor is None
+        sources = service.DecompileMany(pycs + [b'\xe3\0\0\0'])
+        assert [f'webhook_{i}' in source for i, source in enumerate(sources[:6])] == [True] * 6
+        assert sources[6] is None
+        assert service.executor is not None
+        assert service.misses == 6
+
+def test_dead_executor_is_recreated():
+    pyc = makePyc("W = 'webhook_one'")
+    with DecompilerService(StubBackend(), workers=2) as service:
+        dead = ThreadPoolExecutor(max_workers=1)
+        dead.shutdown()
+        service.executor = dead
+        assert service.Decompile(pyc) is None
+        assert service.executor is None
+        assert 'webhook_one' in service.Decompile(pyc)
+
+def test_nonzero_exit_is_not_cached(tmp_path):
+    script = tmp_path / 'fake_pycdc.py'
+    script.write_text("import sys\nprint('partial')\nsys.exit(1)\n")
+    wrapper = tmp_path / 'fake_pycdc'
+    wrapper.write_text(f"#!/bin/sh\nexec {sys.executable} {script} \"$@\"\n")
+    os.chmod(wrapper, 0o755)
+
+    pyc = makePyc("W = 'webhook_one'")
+    with DecompilerService(PycdcBackend(str(wrapper)), workers=0) as service:
+        assert service.Decompile(pyc) is None
+        assert len(service.cache) == 0
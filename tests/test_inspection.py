@@ -0,0 +1,118 @@
+import struct
+import zipfile
+from app.utils.inspection import InspectFile, PythonVersionFromMagic, MEI_MAGIC, SEARCH_CHUNK_SIZE
+
+def magic(number):
+    return number.to_bytes(2, 'little') + b'\r\n'
+
+def makePE(dll=False, padding=64):
+    header = b'MZ' + b'\0' * (0x3c - 2) + struct.pack('<I', 0x40)
+    coff = b'PE\0\0' + b'\0' * 18 + struct.pack('<H', 0x2102 if dll else 0x0102)
+    return header + coff + b'\0' * padding
+
+def makeTOCEntry(name, offset, compsize, size, flag, typecompressed):
+    name = name.encode() + b'\0'
+    name += b'\0' * (-len(name) % 16)
+    return struct.pack('!iIIIBc', 18 + len(name), offset, compsize, size, flag, typecompressed) + name
+
+def makeArchive(entries, pyver=39, cookie21=True, trailer=b''):
+    data = b''
+    toc = b''
+    for name, blob, typecompressed in entries:
+        toc += makeTOCEntry(name, len(data), len(blob), len(blob), 0, typecompressed)
+        data += blob
+    tocPos = len(data)
+    data += toc
+    if cookie21:
+        cookie = struct.pack('!8sIIII64s', MEI_MAGIC, len(data) + 88, tocPos, len(toc), pyver, b'python39.dll')
+    else:
+        cookie = struct.pack('!8sIIII', MEI_MAGIC, len(data) + 24, tocPos, len(toc), pyver)
+    return data + cookie + trailer
+
+def inspect(tmp_path, content, **kwargs):
+    path = tmp_path / 'sample.exe'
+    path.write_bytes(content)
+    return InspectFile(str(path), **kwargs)
+
+def test_magic_table_boundaries():
+    assert PythonVersionFromMagic(magic(2999)) is None
+    assert PythonVersionFromMagic(magic(3000)) == '3.0'
+    assert PythonVersionFromMagic(magic(3413)) == '3.8'
+    assert PythonVersionFromMagic(magic(3649)) == '3.14'
+    assert PythonVersionFromMagic(magic(3650)) is None
+    assert PythonVersionFromMagic(magic(3699)) is None
+    assert PythonVersionFromMagic(magic(62161)) == '2.6'
+    assert PythonVersionFromMagic(magic(62211)) == '2.7'
+    assert PythonVersionFromMagic(magic(50000)) is None
+    assert PythonVersionFromMagic(b'\x55\x0d\0\0') is None
+
+def test_pyz_magic_wins_over_headerless_module(tmp_path):
+    headerless = b'\xe3\0\0\0' + b'\0' * 32
+    pyz = b'PYZ\0' + magic(3413) + b'\0' * 32
+    archive = makeArchive([
+        ('pyimod01_archive', headerless, b'm'),
+        ('PYZ-00.pyz', pyz, b'z'),
+        ('blank.aes', b'abcde', b'x'),
+    ])
+    report = inspect(tmp_path, makePE() + archive, listEntries=True)
+    info = report['additional_info']
+    assert report['type'] == 'Windows Executable'
+    assert report['python_version'] == '3.8'
+    assert report['pyinstaller_version'] == '5.3+'
+    assert report['family'] == 'Blank Grabber'
+    assert info['pyc_magic'] == magic(3413).hex()
+    assert info['entry_count'] == 3
+    assert info['uncompressed_size'] == len(headerless) + len(pyz) + 5
+    assert info['entries'] == ['pyimod01_archive', 'PYZ-00.pyz', 'blank.aes']
+    assert 'entries' not in inspect(tmp_path, makePE() + archive)['additional_info']
+
+def test_cookie_python_version_fallback(tmp_path):
+    archive = makeArchive([('pyimod01_os_path', b'\xe3' * 16, b'm')], pyver=310)
+    report = inspect(tmp_path, makePE() + archive)
+    assert report['python_version'] == '3.10'
+    assert report['pyinstaller_version'] == '3.0-5.2'
+    assert 'pyc_magic' not in report['additional_info']
+
+def test_pyinstaller_20_cookie(tmp_path):
+    archive = makeArchive([('main', b'\0' * 8, b's')], pyver=27, cookie21=False)
+    report = inspect(tmp_path, makePE() + archive)
+    assert report['pyinstaller_version'] == '2.0'
+    assert report['python_version'] == '2.7'
+
+def test_cookie_across_chunk_boundary(tmp_path):
+    archive = makeArchive([('main', b'\0' * 8, b's')])
+    # Put the cookie magic across the first 8 KiB boundary searched from the end
+    trailer = b'\0' * (SEARCH_CHUNK_SIZE + 3 - 88)
+    report = inspect(tmp_path, makePE() + archive + trailer)
+    assert report['additional_info']['entry_count'] == 1
+
+def test_truncated_toc(tmp_path):
+    archive = makeArchive([('main', b'\0' * 8, b's')])
+    cookie = archive[-88:]
+    (_, length, tocPos, tocLen, pyver) = struct.unpack('!8sIIII', cookie[:24])
+    broken = struct.pack('!8sIIII', MEI_MAGIC, length, tocPos, tocLen - 10, pyver) + cookie[24:]
+    report = inspect(tmp_path, makePE() + archive[:-88] + broken)
+    assert 'error' in report['additional_info']
+    assert report['pyinstaller_version'] is None
+
+def test_plain_pe_and_dll(tmp_path):
+    report = inspect(tmp_path, makePE())
+    assert report['type'] == 'Windows Executable'
+    assert report['pyinstaller_version'] is None
+    assert report['additional_info']['entry_count'] == 0
+    assert 'error' not in report['additional_info']
+    assert inspect(tmp_path, makePE(dll=True))['type'] == 'Windows DLL'
+
+def test_pyc_and_jar(tmp_path):
+    pyc = tmp_path / 'sample.pyc'
+    pyc.write_bytes(magic(3495) + b'\0' * 12)
+    assert InspectFile(str(pyc))['python_version'] == '3.11'
+
+    jar = tmp_path / 'sample.jar'
+    with zipfile.ZipFile(jar, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('a.class', b'x' * 100)
+        z.writestr('b.class', b'y' * 50)
+    report = InspectFile(str(jar))
+    assert report['type'] == 'Java Archive'
+    assert report['additional_info']['entry_count'] == 2
+    assert report['additional_info']['uncompressed_size'] == 150